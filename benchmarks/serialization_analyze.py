@@ -1,50 +1,140 @@
 #!/usr/bin/env python3
 """
 Process Google Benchmark JSON output and create organized, readable reports.
+
+The analysis is plain Python, so it also runs under PyPy, whose JIT handles the
+indexing loop well on large sweeps:
+
+    pypy3 serialization_analyze.py benchmark_results.json
+
+build.sh uses python3 by default; run it with PYTHON_CMD=pypy3 to opt in.
 """
+import importlib
 import json
+import mmap
+import os
+import re
 import sys
 from collections import defaultdict
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, List, Any, NamedTuple
+
+# Below this size the stdlib parser is fast enough that orjson's setup cost dominates
+ORJSON_MIN_BYTES = 256 * 1024
+# Above this size benchmarks are streamed with ijson so the full property bag is never built
+IJSON_MIN_BYTES = 64 * 1024 * 1024
+
+# Horizontal rules for headers and each report table
+HEADER_RULE = '=' * 90
+ADAPTER_TABLE_RULE = '-' * 92
+RANKING_TABLE_RULE = '-' * 58
+SCALING_TABLE_RULE = '-' * 52
+
+# Row formatters for headers and each report table, bound once instead of parsing a format spec per row
+HEADER_TITLE = "{:^90}".format
+ADAPTER_ROW = "{:<12} {:<12} {:<12} {:<20} {:<20}".format
+RANKING_HEADER_ROW = "{:<6} {:<12} {:<12} {:<12} {:<12}".format
+RANKING_ROW = "{:<6} {:<12} {:<12} {}x{:<7} {:<12}".format
+SCALING_ROW = "{:<12} {:<12} {:<12} {:<12}".format
+
+# Adapters in report order
+ADAPTER_ORDER = tuple(sys.intern(adapter) for adapter in ('Text', 'Binary', 'LazyJson', 'RapidJson', 'Yaml'))
+
+class ParsedName(NamedTuple):
+    """Components of a benchmark name."""
+    category: str
+    adapter: str
+    data: str
+    operation: str
+
+UNKNOWN_NAME = ParsedName("unknown", "unknown", "unknown", "unknown")
+# <prefix>_<category>_<adapter>[_<data>[_<operation>]]; the prefix (normally BM) and
+# anything after the operation are ignored
+BENCHMARK_NAME_PATTERN = re.compile(
+    r'[^_]*_(Serializable|MultiSerializable|Adapter)_([^_]*)(?:_([^_]*)(?:_([^_]*))?)?')
 
-def parse_benchmark_name(name: str) -> Dict[str, str]:
+@lru_cache(maxsize=None)
+def parse_benchmark_name(name: str) -> ParsedName:
     """Parse benchmark name into components."""
-    parts = name.split('_')
-    if len(parts) < 3:
-        return {"category": "unknown", "adapter": "unknown", "data": "unknown", "operation": "unknown"}
-    
-    if parts[1] == "Serializable":
-        return {
-            "category": "Serializable",
-            "adapter": parts[2],
-            "data": parts[3] if len(parts) > 3 else "unknown",
-            "operation": parts[4] if len(parts) > 4 else "serialize"
-        }
-    elif parts[1] == "MultiSerializable":
-        return {
-            "category": "MultiSerializable", 
-            "adapter": parts[2],
-            "data": parts[3] if len(parts) > 3 else "unknown",
-            "operation": parts[4] if len(parts) > 4 else "serialize"
-        }
-    elif parts[1] == "Adapter":
-        return {
-            "category": "Adapter",
-            "adapter": parts[2],
-            "data": parts[3] if len(parts) > 3 else "unknown", 
-            "operation": parts[4] if len(parts) > 4 else "serialize"
-        }
-    
-    return {"category": "unknown", "adapter": "unknown", "data": "unknown", "operation": "unknown"}
+    match = BENCHMARK_NAME_PATTERN.match(name)
+    if not match:
+        return UNKNOWN_NAME
+    
+    category, adapter, data, operation = match.groups()
+    # Intern the tokens so index lookups and category checks compare by identity
+    return ParsedName(
+        sys.intern(category),
+        sys.intern(adapter),
+        sys.intern(data) if data is not None else "unknown",
+        sys.intern(operation) if operation is not None else "serialize",
+    )
+
+@lru_cache(maxsize=None)
+def _optional_import(name: str):
+    """Import an optional module on first use, or return None if it is not installed."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+def orjson_load(f) -> Any:
+    """Parse an open binary file with orjson, mapping it instead of copying it when possible."""
+    orjson = _optional_import('orjson')
+    try:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # Pipes and other unmappable files
+        return orjson.loads(f.read())
+    try:
+        with memoryview(mapped) as view:
+            return orjson.loads(view)
+    finally:
+        mapped.close()
+
+# Name suffixes Google Benchmark gives repetition aggregates
+AGGREGATE_SUFFIXES = ('_mean', '_median', '_stddev', '_cv')
+
+def is_measurement(bench: Dict[str, Any]) -> bool:
+    """Whether a benchmark entry is a single BM_* run rather than an aggregate."""
+    name = bench['name']
+    return (bench.get('run_type', 'iteration') == 'iteration' and
+            name.startswith('BM_') and
+            not name.endswith(AGGREGATE_SUFFIXES))
+
+def load_benchmarks(path: str) -> List[Dict[str, Any]]:
+    """Load the benchmark runs from a Google Benchmark JSON file.
+
+    Very large files are streamed with ijson when available, keeping only the
+    fields the reports use. Otherwise the whole document is parsed, with orjson
+    for large files when available. Aggregate rows are dropped so repetitions
+    are not counted twice.
+    """
+    size = os.path.getsize(path)
+    ijson = _optional_import('ijson') if size > IJSON_MIN_BYTES else None
+    if ijson is not None:
+        try:
+            with open(path, 'rb') as f:
+                return [{'name': bench['name'], 'cpu_time': bench['cpu_time']}
+                        for bench in ijson.items(f, 'benchmarks.item', use_float=True)
+                        if is_measurement(bench)]
+        except ijson.JSONError as e:
+            raise ValueError(e) from e
+
+    if size > ORJSON_MIN_BYTES and _optional_import('orjson') is not None:
+        with open(path, 'rb') as f:
+            data = orjson_load(f)
+    else:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    return [bench for bench in data.get('benchmarks', []) if is_measurement(bench)]
+
+# (divisor, format) per unit, indexed by the magnitude of the time in nanoseconds
+TIME_UNITS = ((1, "{:.0f}ns"), (1e3, "{:.1f}μs"), (1e6, "{:.1f}ms"))
 
 def format_time(ns: float) -> str:
     """Format time in appropriate units."""
-    if ns < 1000:
-        return f"{ns:.0f}ns"
-    elif ns < 1000000:
-        return f"{ns/1000:.1f}μs"
-    else:
-        return f"{ns/1000000:.1f}ms"
+    divisor, fmt = TIME_UNITS[0 if ns < 1e3 else 1 if ns < 1e6 else 2]
+    return fmt.format(ns / divisor)
 
 def calculate_overhead(baseline: float, comparison: float) -> str:
     """Calculate overhead percentage."""
@@ -56,98 +146,108 @@ def calculate_overhead(baseline: float, comparison: float) -> str:
     else:
         return f"{overhead:.1f}%"
 
-def print_header(title: str):
-    """Print a formatted header."""
-    print(f"\n{'='*90}")
-    print(f"{title:^90}")
-    print(f"{'='*90}")
+def header_lines(title: str) -> List[str]:
+    """Build the lines of a formatted header."""
+    return ["", HEADER_RULE, HEADER_TITLE(title), HEADER_RULE]
+
+def write_lines(lines: List[str]):
+    """Write a whole report to stdout in one call."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def build_index(benchmarks: List[Dict]) -> Dict[str, Any]:
+    """Walk the benchmarks once and bucket cpu times for every report."""
+    # ParsedName -> cpu_time
+    times = {}
+    # lowercased data -> adapter -> operation -> cpu_time, Adapter category only
+    adapter_results = defaultdict(lambda: defaultdict(dict))
+    # Running sums and counts for the averages: keyed by adapter for the
+    # ranking and by (adapter, data) for Simple/Complex scaling
+    adapter_sum = defaultdict(float)
+    adapter_n = defaultdict(int)
+    scaling_sum = defaultdict(float)
+    scaling_n = defaultdict(int)
 
-def get_multi_overhead(benchmarks: List[Dict], adapter: str, data: str, operation: str) -> str:
-    """Get MultiSerializable overhead for given parameters."""
-    serializable_time = None
-    multi_time = None
-    
     for bench in benchmarks:
         name_parts = parse_benchmark_name(bench['name'])
-        if (name_parts['adapter'] == adapter and 
-            name_parts['data'] == data and 
-            name_parts['operation'] == operation):
-            if name_parts['category'] == 'Serializable':
-                serializable_time = bench['cpu_time']
-            elif name_parts['category'] == 'MultiSerializable':
-                multi_time = bench['cpu_time']
-    
+        cpu_time = bench['cpu_time']
+
+        times[name_parts] = cpu_time
+        if name_parts.category == 'Adapter':
+            adapter = name_parts.adapter
+            adapter_results[name_parts.data.lower()][adapter][name_parts.operation] = cpu_time
+            adapter_sum[adapter] += cpu_time
+            adapter_n[adapter] += 1
+            if name_parts.data in ('Simple', 'Complex'):
+                key = (adapter, name_parts.data)
+                scaling_sum[key] += cpu_time
+                scaling_n[key] += 1
+
+    adapter_averages = {a: (adapter_sum[a] / adapter_n[a], adapter_n[a]) for a in adapter_sum}
+    scaling_averages = {k: (scaling_sum[k] / scaling_n[k], scaling_n[k]) for k in scaling_sum}
+
+    return {
+        'times': times,
+        'adapter_results': adapter_results,
+        # adapter -> (avg_time, count)
+        'adapter_averages': adapter_averages,
+        # (adapter, data) -> (avg_time, count)
+        'scaling_averages': scaling_averages,
+    }
+
+def get_multi_overhead(times: Dict[ParsedName, float], adapter: str, data: str, operation: str) -> str:
+    """Get MultiSerializable overhead for given parameters."""
+    serializable_time = times.get(ParsedName('Serializable', adapter, data, operation))
+    multi_time = times.get(ParsedName('MultiSerializable', adapter, data, operation))
+
     if serializable_time and multi_time:
         return calculate_overhead(serializable_time, multi_time)
     return "N/A"
 
-def print_adapter_comparison(benchmarks: List[Dict], data_type: str):
-    """Print comprehensive adapter comparison for a data type."""
-    print_header(f"🚀 {data_type.upper()} DATA PERFORMANCE")
+def render_adapter_comparison(index: Dict[str, Any], data_type: str) -> List[str]:
+    """Render comprehensive adapter comparison for a data type."""
+    lines = header_lines(f"🚀 {data_type.upper()} DATA PERFORMANCE")
     
     # Get all adapter results for this data type
-    adapter_results = defaultdict(dict)
-    
-    for bench in benchmarks:
-        name_parts = parse_benchmark_name(bench['name'])
-        if name_parts['category'] == 'Adapter' and name_parts['data'].lower() == data_type.lower():
-            adapter = name_parts['adapter']
-            operation = name_parts['operation']
-            adapter_results[adapter][operation] = bench['cpu_time']
-    
-    # Get overhead data for all adapters that have Serializable versions
-    overhead_data = {}
-    for adapter in ['Text', 'Binary', 'LazyJson', 'RapidJson', 'Yaml']:
-        for operation in ['Serialize', 'Deserialize']:
-            key = f"{adapter}_{operation}"
-            overhead_data[key] = get_multi_overhead(benchmarks, adapter, data_type, operation)
+    adapter_results = index['adapter_results'].get(data_type.lower(), {})
+    times = index['times']
     
     # Print table
-    print(f"{'Adapter':<12} {'Serialize':<12} {'Deserialize':<12} {'Runtime vs Static (S)':<20} {'Runtime vs Static (D)':<20}")
-    print("-" * 92)
+    lines.append(ADAPTER_ROW('Adapter', 'Serialize', 'Deserialize', 'Runtime vs Static (S)', 'Runtime vs Static (D)'))
+    lines.append(ADAPTER_TABLE_RULE)
     
     # Sort adapters for consistent ordering
-    adapter_order = ['Text', 'Binary', 'LazyJson', 'RapidJson', 'Yaml']
-    
-    for adapter in adapter_order:
+    for adapter in ADAPTER_ORDER:
         if adapter in adapter_results:
             results = adapter_results[adapter]
             serialize_time = format_time(results.get('Serialize', 0)) if 'Serialize' in results else "N/A"
             deserialize_time = format_time(results.get('Deserialize', 0)) if 'Deserialize' in results else "N/A"
             
             # Get overhead if available
-            serialize_overhead = overhead_data.get(f"{adapter}_Serialize", "N/A")
-            deserialize_overhead = overhead_data.get(f"{adapter}_Deserialize", "N/A")
+            serialize_overhead = get_multi_overhead(times, adapter, data_type, 'Serialize')
+            deserialize_overhead = get_multi_overhead(times, adapter, data_type, 'Deserialize')
             
-            print(f"{adapter:<12} {serialize_time:<12} {deserialize_time:<12} {serialize_overhead:<20} {deserialize_overhead:<20}")
-
-def print_performance_rankings(benchmarks: List[Dict]):
-    """Print overall performance ranking based on average performance."""
-    print_header("🏆 OVERALL PERFORMANCE RANKING")
+            lines.append(ADAPTER_ROW(adapter, serialize_time, deserialize_time, serialize_overhead, deserialize_overhead))
     
-    # Calculate average performance for each adapter
-    adapter_totals = defaultdict(list)
-    
-    for bench in benchmarks:
-        name_parts = parse_benchmark_name(bench['name'])
-        if name_parts['category'] == 'Adapter':
-            adapter_totals[name_parts['adapter']].append(bench['cpu_time'])
+    return lines
+
+def render_performance_rankings(index: Dict[str, Any]) -> List[str]:
+    """Render overall performance ranking based on average performance."""
+    lines = header_lines("🏆 OVERALL PERFORMANCE RANKING")
     
     # Calculate averages and rank
     adapter_averages = []
-    for adapter, times in adapter_totals.items():
-        avg_time = sum(times) / len(times)
-        adapter_averages.append({'adapter': adapter, 'avg_time': avg_time, 'count': len(times)})
+    for adapter, (avg_time, count) in index['adapter_averages'].items():
+        adapter_averages.append({'adapter': adapter, 'avg_time': avg_time, 'count': count})
     
     # Sort by average time (ascending = faster)
     adapter_averages.sort(key=lambda x: x['avg_time'])
     
-    print(f"{'Rank':<6} {'Adapter':<12} {'Avg Time':<12} {'Benchmarks':<12} {'vs Middle':<12}")
-    print("-" * 58)
+    lines.append(RANKING_HEADER_ROW('Rank', 'Adapter', 'Avg Time', 'Benchmarks', 'vs Middle'))
+    lines.append(RANKING_TABLE_RULE)
     
     # Use middle performer as baseline
     middle_index = len(adapter_averages) // 2
-    baseline_time = adapter_averages[middle_index]['avg_time']
+    baseline_time = adapter_averages[middle_index]['avg_time'] if adapter_averages else 0
     
     for i, result in enumerate(adapter_averages, 1):
         if i == middle_index + 1:
@@ -156,67 +256,90 @@ def print_performance_rankings(benchmarks: List[Dict]):
             vs_baseline = calculate_overhead(baseline_time, result['avg_time'])
         
         medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
-        print(f"{medal:<6} {result['adapter']:<12} {format_time(result['avg_time']):<12} "
-              f"{result['count']}x{'':<7} {vs_baseline:<12}")
+        lines.append(RANKING_ROW(medal, result['adapter'], format_time(result['avg_time']),
+                                 result['count'], '', vs_baseline))
+    
+    return lines
 
-def print_scaling_analysis(benchmarks: List[Dict]):
+def render_scaling_analysis(index: Dict[str, Any]) -> List[str]:
     """Analyze how adapters scale from Simple to Complex data."""
-    print_header("📈 COMPLEXITY SCALING ANALYSIS")
-    
-    # Get simple and complex times for each adapter
-    scaling_data = defaultdict(dict)
-    
-    for bench in benchmarks:
-        name_parts = parse_benchmark_name(bench['name'])
-        if name_parts['category'] == 'Adapter' and name_parts['data'] in ['Simple', 'Complex']:
-            key = name_parts['adapter']
-            if name_parts['data'] not in scaling_data[key]:
-                scaling_data[key][name_parts['data']] = []
-            scaling_data[key][name_parts['data']].append(bench['cpu_time'])
+    lines = header_lines("📈 COMPLEXITY SCALING ANALYSIS")
     
     # Calculate averages and scaling
-    print(f"{'Adapter':<12} {'Simple Avg':<12} {'Complex Avg':<12} {'Scaling':<12}")
-    print("-" * 52)
+    lines.append(SCALING_ROW('Adapter', 'Simple Avg', 'Complex Avg', 'Scaling'))
+    lines.append(SCALING_TABLE_RULE)
+    
+    averages = index['scaling_averages']
     
-    for adapter, data in scaling_data.items():
-        if 'Simple' in data and 'Complex' in data:
-            simple_avg = sum(data['Simple']) / len(data['Simple'])
-            complex_avg = sum(data['Complex']) / len(data['Complex'])
+    for adapter in dict.fromkeys(adapter for adapter, _ in averages):
+        if (adapter, 'Simple') in averages and (adapter, 'Complex') in averages:
+            simple_avg = averages[(adapter, 'Simple')][0]
+            complex_avg = averages[(adapter, 'Complex')][0]
             scaling = calculate_overhead(simple_avg, complex_avg)
             
-            print(f"{adapter:<12} {format_time(simple_avg):<12} {format_time(complex_avg):<12} {scaling:<12}")
+            lines.append(SCALING_ROW(adapter, format_time(simple_avg), format_time(complex_avg), scaling))
+    
+    return lines
+
 
+def analyze_one(path: str) -> str:
+    """Analyze one benchmark JSON file and return the rendered report."""
+    try:
+        benchmarks = load_benchmarks(path)
+    except (FileNotFoundError, ValueError) as e:
+        raise ValueError(f"Error reading JSON file: {e}") from e
+    
+    if not benchmarks:
+        raise ValueError("No benchmark data found in JSON file")
+    
+    lines = [
+        "🚀 Lazy-CPP Serialization Benchmark Analysis",
+        f"Generated from {len(benchmarks)} benchmark measurements",
+    ]
+    
+    index = build_index(benchmarks)
+    
+    # Organized results
+    lines += render_adapter_comparison(index, "Simple")
+    lines += render_adapter_comparison(index, "Complex")
+    lines += render_performance_rankings(index)
+    lines += render_scaling_analysis(index)
+    
+    lines += ["", HEADER_RULE, "Analysis complete!", HEADER_RULE]
+    return "\n".join(lines)
 
 def main():
     """Main processing function."""
     if len(sys.argv) < 2:
-        print("Usage: python3 analyze_serialization.py <benchmark_results.json>")
-        sys.exit(1)
-    
-    try:
-        with open(sys.argv[1], 'r') as f:
-            data = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        print(f"Error reading JSON file: {e}")
+        print("Usage: python3 analyze_serialization.py <benchmark_results.json> [<benchmark_results.json> ...]")
         sys.exit(1)
     
-    benchmarks = data.get('benchmarks', [])
-    if not benchmarks:
-        print("No benchmark data found in JSON file")
-        sys.exit(1)
+    paths = sys.argv[1:]
+    if len(paths) == 1:
+        try:
+            write_lines([analyze_one(paths[0])])
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+        return
     
-    print("🚀 Lazy-CPP Serialization Benchmark Analysis")
-    print(f"Generated from {len(benchmarks)} benchmark measurements")
+    # Only multi-file runs pay for importing multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
     
-    # Print organized results
-    print_adapter_comparison(benchmarks, "Simple")
-    print_adapter_comparison(benchmarks, "Complex")
-    print_performance_rankings(benchmarks)
-    print_scaling_analysis(benchmarks)
+    # Files are independent, so analyze them in parallel and print in argument order
+    failed = False
+    with ProcessPoolExecutor() as executor:
+        futures = [executor.submit(analyze_one, path) for path in paths]
+        for path, future in zip(paths, futures):
+            try:
+                report = future.result()
+            except ValueError as e:
+                report = str(e)
+                failed = True
+            write_lines(["", f"📄 {path}", report])
     
-    print(f"\n{'='*90}")
-    print("Analysis complete!")
-    print(f"{'='*90}")
+    if failed:
+        sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -47,6 +47,9 @@ OPTIONS:
     -t, --test          Run tests after building
     -v, --verbose       Verbose output
 
+ENVIRONMENT:
+    PYTHON_CMD          Interpreter for benchmark post-processing (default: python3, then python)
+
 EXAMPLES:
     $0                  # Build in Release mode
     $0 -c -d            # Clean build in Debug mode
@@ -54,6 +57,7 @@ EXAMPLES:
     $0 -c -r            # Clean build and run examples
     $0 -t               # Build and run tests
     $0 -b               # Build and run benchmarks
+    PYTHON_CMD=pypy3 $0 -b  # Post-process benchmark results with PyPy
     $0 -c -t -r -b      # Clean build, run tests, examples and benchmarks
     $0 --format --clean --debug --test --run --benchmark  # Full development cycle
 
@@ -184,12 +188,17 @@ run_benchmarks() {
     echo "========================================"
     cd "$BUILD_DIR"
     
-    # Check if Python is available for post-processing
-    PYTHON_CMD=""
-    if command -v python3 &> /dev/null; then
-        PYTHON_CMD="python3"
-    elif command -v python &> /dev/null; then
-        PYTHON_CMD="python"
+    # Check if Python is available for post-processing (PYTHON_CMD overrides, e.g. pypy3)
+    if [ -n "$PYTHON_CMD" ] && ! command -v "$PYTHON_CMD" &> /dev/null; then
+        print_warning "PYTHON_CMD '$PYTHON_CMD' not found, falling back to python3/python"
+        PYTHON_CMD=""
+    fi
+    if [ -z "$PYTHON_CMD" ]; then
+        if command -v python3 &> /dev/null; then
+            PYTHON_CMD="python3"
+        elif command -v python &> /dev/null; then
+            PYTHON_CMD="python"
+        fi
     fi
     
     if [ -n "$PYTHON_CMD" ] && [ -f "../benchmarks/serialization_analyze.py" ]; then